@@ -1,11 +1,20 @@
 import sqlite3
+import sys
 
 conn = sqlite3.connect('schedules.db')
 cur = conn.cursor()
 
+out = sys.stdout
 for table in ['transactions', 'covenants', 'schedules']:
-    print(f'--- {table} ---')
-    for row in cur.execute(f'SELECT * FROM {table}'):
-        print(row)
+    out.write(f'--- {table} ---\n')
+    # Fetch in batches and emit one write per batch instead of one print
+    # (and one syscall) per row.
+    cur.execute(f'SELECT * FROM {table}')
+    while True:
+        rows = cur.fetchmany(10000)
+        if not rows:
+            break
+        out.write('\n'.join(map(str, rows)))
+        out.write('\n')
 
-conn.close()
\ No newline at end of file
+conn.close()
@@ -0,0 +1,14 @@
+# Shared pytest fixtures for the test suite.
+
+import pytest
+from schedule_generator import ScheduleGenerator
+
+
+@pytest.fixture(scope="module")
+def sg():
+    """
+    Default ScheduleGenerator shared across a test module. The generator's
+    state (holiday set, business-day bitset, memo cache) is read-mostly, so
+    one instance per module avoids rebuilding it for every test.
+    """
+    return ScheduleGenerator()
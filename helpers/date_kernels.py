@@ -0,0 +1,92 @@
+"""
+Numeric date-arithmetic kernels used by the test suite to derive expected
+schedule shapes instead of hardcoding them.
+
+Everything here works on proleptic-Gregorian ordinals (date.toordinal
+convention, 0001-01-01 == 1) in plain integer arithmetic, so the functions
+compile under Numba's nopython mode when it is installed. Numba is optional:
+without it the same functions run as ordinary Python, just slower.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised only without numba
+    def njit(*args, **kwargs):
+        """Pass-through stand-in supporting @njit and @njit(...) forms."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+# date(1970, 1, 1).toordinal(); bridges the epoch-day math below to ordinals.
+_UNIX_EPOCH_ORDINAL = 719163
+
+
+@njit(cache=True)
+def _days_in_month(year, month):
+    if month == 2:
+        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+            return 29
+        return 28
+    if month == 4 or month == 6 or month == 9 or month == 11:
+        return 30
+    return 31
+
+
+@njit(cache=True)
+def _civil_to_ordinal(year, month, day):
+    # Howard Hinnant's days_from_civil, shifted to toordinal convention.
+    y = year - (1 if month <= 2 else 0)
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468 + _UNIX_EPOCH_ORDINAL
+
+
+@njit(cache=True)
+def _ordinal_to_civil(ordinal):
+    # Inverse of _civil_to_ordinal (Hinnant's civil_from_days).
+    z = ordinal - _UNIX_EPOCH_ORDINAL + 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    y = yoe + era * 400
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    return (y + (1 if month <= 2 else 0), month, day)
+
+
+@njit(cache=True)
+def expand_monthly(start_ord, end_ord, step):
+    """
+    Ordinals of the month-stepped due dates in (start, end]: start plus
+    step, 2*step, ... months, day-of-month clamped to the target month's
+    length, stopping once a due date passes end_ord. This is the raw
+    rollout before any business-day adjustment.
+    """
+    year, month, day = _ordinal_to_civil(start_ord)
+    out = np.empty((end_ord - start_ord) // (28 * step) + 2, np.int64)
+    count = 0
+    i = step
+    while True:
+        m = month - 1 + i
+        y = year + m // 12
+        mo = m % 12 + 1
+        d = day
+        last = _days_in_month(y, mo)
+        if d > last:
+            d = last
+        due = _civil_to_ordinal(y, mo, d)
+        if due > end_ord:
+            break
+        out[count] = due
+        count += 1
+        i += step
+    return out[:count]
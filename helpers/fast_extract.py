@@ -0,0 +1,19 @@
+"""
+Shared due-date extraction for the test suite.
+
+If a compiled _fast_extract extension is on the path (e.g. built from a
+Cython source in an environment that has a C toolchain) its due_dates is
+used; otherwise the fallback keeps the per-entry key access at C speed via
+operator.itemgetter. Both accept any sequence of entries supporting
+['due_date'] lookup and return the due dates in order.
+"""
+
+from operator import itemgetter
+
+get_due_date = itemgetter('due_date')
+
+try:
+    from _fast_extract import due_dates
+except ImportError:
+    def due_dates(schedules):
+        return list(map(get_due_date, schedules))
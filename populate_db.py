@@ -18,10 +18,8 @@ covenants = [
 sg = ScheduleGenerator()
 schedules = sg.generate_schedules(transaction, covenants)
 
-# Save to database
+# Save to database in one transaction (single commit for the whole load)
 with Database('schedules.db') as db:
-    db.save_transaction(transaction)
-    db.save_covenants(covenants)
-    db.save_schedules(schedules)
+    db.bulk_save([transaction], covenants, schedules)
 
 print(f"Generated {len(schedules)} schedule entries")
\ No newline at end of file
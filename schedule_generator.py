@@ -2,17 +2,139 @@
 # Covenant Schedule Generator
 # =============================
 
+import copy
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, date
-from dateutil.relativedelta import relativedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import calendar
+import os
+import re
+import sys
+import threading
 import holidays
+import numpy as np
 
-# Default fallback holidays 
-DEFAULT_HOLIDAYS = set([
-    # Additional holidays can be added here
+# Compiled once; _validate_covenant runs it for every covenant. google-re2
+# matches with a DFA (no backtracking), so prefer it when installed and fall
+# back to the stdlib engine otherwise — the pattern works under both.
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+_EMAIL_RE = _regex_engine.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+
+# Strict YYYY-MM-DD shape for the fast-path parser below.
+_ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+
+
+def _parse_iso_date(s: str) -> date:
+    """
+    Fast-path 'YYYY-MM-DD' parse: one regex match plus three int
+    conversions, skipping date.fromisoformat's more general validator.
+    Raises ValueError on malformed input, same as fromisoformat.
+    """
+    m = _ISO_DATE_RE.match(s)
+    if not m:
+        raise ValueError(f"Invalid isoformat string: {s!r}")
+    return date(int(m[1]), int(m[2]), int(m[3]))
+
+# One interned status instance shared by every generated entry.
+_STATUS_PENDING = sys.intern('pending')
+
+# Default fallback holidays, stored as day ordinals (date.toordinal())
+DEFAULT_HOLIDAY_ORDINALS = set([
+    # Additional holiday ordinals can be added here
 ])
 
+# Day ordinal of the Unix epoch (1970-01-01), for ordinal <-> datetime64[D] conversion
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Most distinct (transaction, covenants) batches a generator instance keeps
+# memoized results for before evicting the oldest.
+SCHEDULE_CACHE_MAX = 32
+
+# Covenant batches at or above this size fan generation out across a thread
+# pool; below it, pool startup outweighs the win.
+PARALLEL_COVENANT_THRESHOLD = 32
+
+
+# Days in each month of a non-leap year, 1-indexed by month.
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Precomputed month lengths for 1900-2100 (2412 bytes), one indexed byte read
+# per lookup instead of a leap-year branch. Years outside fall back below.
+_EOM_BASE_YEAR = 1900
+_EOM_LAST_YEAR = 2100
+_EOM = bytes(
+    29 if m == 2 and calendar.isleap(y) else _DAYS_IN_MONTH[m]
+    for y in range(_EOM_BASE_YEAR, _EOM_LAST_YEAR + 1) for m in range(1, 13)
+)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Length of a month: precomputed table read, leap-year branch outside it."""
+    if _EOM_BASE_YEAR <= year <= _EOM_LAST_YEAR:
+        return _EOM[(year - _EOM_BASE_YEAR) * 12 + month - 1]
+    if month == 2 and calendar.isleap(year):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+def _add_months(d: date, months: int) -> date:
+    """
+    Add a number of months to a date, clamping the day to the end of the
+    target month (Jan 31 + 1 month -> Feb 28/29). Same calendar semantics
+    as dateutil's relativedelta(months=...), without the generic field
+    machinery. Month lengths come from a lookup table plus a leap-year
+    branch rather than calendar.monthrange.
+    """
+    idx = d.month - 1 + months
+    year = d.year + idx // 12
+    month = idx % 12 + 1
+    return date(year, month, min(d.day, _days_in_month(year, month)))
+
+
+@dataclass(slots=True)
+class ScheduleEntry:
+    """
+    A single schedule row. Slotted for a compact memory layout, since daily
+    covenants over long transactions emit tens of thousands of entries.
+    Supports the dict-style access existing callers use.
+    """
+    schedule_id: str
+    covenant_id: str
+    due_date: str
+    status: str
+    period_start: str
+    period_end: str
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def pop(self, key, default=None):
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            return default
+        delattr(self, key)
+        return value
+
+    def copy(self) -> 'ScheduleEntry':
+        return copy.copy(self)
+
+    def as_tuple(self) -> tuple:
+        """Bind tuple in schedules-table column order, for executemany."""
+        return (self.schedule_id, self.covenant_id, self.due_date,
+                self.status, self.period_start, self.period_end)
+
 class ScheduleGenerator:
     """
     Generates covenant fulfillment schedules for a transaction, supporting multiple frequencies and business rules.
@@ -29,24 +151,57 @@ class ScheduleGenerator:
             country (str): Country code for holidays package (default 'IN' for India)
             years (list, optional): List of years for which to generate holidays (default: current year)
         """
-        # Set up holidays
+        # Set up holidays. Business-day checks run on day ordinals (integer
+        # set lookups); self.holidays keeps the 'YYYY-MM-DD' string form for
+        # callers that inspect it.
         if holidays is not None:
             self.holidays = set(holidays)
+            # Entries that are not valid ISO dates can never match a real
+            # date, so they are skipped (same effect as the previous string
+            # comparison).
+            self._holiday_ordinals = set()
+            for h in self.holidays:
+                if isinstance(h, str):
+                    try:
+                        self._holiday_ordinals.add(_parse_iso_date(h).toordinal())
+                    except ValueError:
+                        continue
         else:
-            # Auto-generate using holidays package for the given country and years
+            # Auto-generate using holidays package for the given country and
+            # years; ordinals come straight from the date keys with no string
+            # round-trip.
             if years is None:
                 years = [date.today().year]
             try:
                 country_holidays = holidays.country_holidays(country, years=years)
-                self.holidays = set(d.strftime('%Y-%m-%d') for d in country_holidays.keys())
+                self._holiday_ordinals = {d.toordinal() for d in country_holidays.keys()}
+                self.holidays = {d.isoformat() for d in country_holidays.keys()}
             except Exception:
-                self.holidays = DEFAULT_HOLIDAYS
+                self._holiday_ordinals = set(DEFAULT_HOLIDAY_ORDINALS)
+                self.holidays = {date.fromordinal(o).isoformat() for o in self._holiday_ordinals}
+
+        # Freeze the ordinal set: holiday membership never changes after
+        # construction, and a frozenset makes that explicit (and hashable for
+        # any downstream caching keyed on it).
+        self._holiday_ordinals = frozenset(self._holiday_ordinals)
 
         # Validate business day adjustment direction
         if business_day_adjustment not in ('forward', 'backward'):
             raise ValueError("business_day_adjustment must be 'forward' or 'backward'")
         self.business_day_adjustment = business_day_adjustment
 
+        # Lazily-built business-day bitset (see _ensure_bday_window); empty
+        # until the first adjustment is requested. The (base_word, bits)
+        # table is swapped in as one tuple so concurrent readers never see a
+        # half-updated pair, and rebuilds are serialized by the lock.
+        self._bday_lo = 0
+        self._bday_hi = -1
+        self._bday_table = None
+        self._bday_lock = threading.Lock()
+
+        # Memoized generate_schedules results, keyed by the frozen input batch.
+        self._schedule_cache: Dict[tuple, List[ScheduleEntry]] = {}
+
     # =============================
     # Validation Methods
     # =============================
@@ -55,6 +210,7 @@ class ScheduleGenerator:
     def _validate_transaction(transaction: Dict[str, Any]):
         """
         Validates the transaction dictionary for required fields and correct date logic.
+        Returns the parsed (start, end) dates so callers don't re-parse them.
         Raises ValueError if validation fails.
         """
         required = ['transaction_id', 'name', 'start_date', 'end_date']
@@ -63,69 +219,226 @@ class ScheduleGenerator:
                 raise ValueError(f"Transaction missing required field: {key}")
             if not isinstance(transaction[key], str):
                 raise ValueError(f"Transaction field {key} must be a string")
-        # Validate date format
-        for d in ['start_date', 'end_date']:
-            try:
-                datetime.strptime(transaction[d], '%Y-%m-%d')
-            except Exception:
-                raise ValueError(f"Transaction {d} must be in YYYY-MM-DD format")
+        # Validate date format (fromisoformat raises ValueError natively on bad input)
+        try:
+            start = date.fromisoformat(transaction['start_date'])
+        except ValueError:
+            raise ValueError("Transaction start_date must be in YYYY-MM-DD format")
+        try:
+            end = date.fromisoformat(transaction['end_date'])
+        except ValueError:
+            raise ValueError("Transaction end_date must be in YYYY-MM-DD format")
         # Validate start_date <= end_date
-        start = datetime.strptime(transaction['start_date'], '%Y-%m-%d').date()
-        end = datetime.strptime(transaction['end_date'], '%Y-%m-%d').date()
         if start > end:
             raise ValueError("Transaction start_date must be before or equal to end_date")
+        return start, end
 
-    @staticmethod
-    def _validate_covenant(covenant: Dict[str, Any]):
+    # Covenant field tuples that already passed validation; bounded so a long
+    # run cannot grow it without limit.
+    _covenant_validation_cache: Dict[tuple, None] = {}
+    _COVENANT_VALIDATION_CACHE_MAX = 1024
+
+    @classmethod
+    def _validate_covenant(cls, covenant: Dict[str, Any]):
         """
         Validates the covenant dictionary for required fields, frequency, and email format.
+        Validation is pure in the five checked fields, so a previously seen
+        field tuple skips the per-field checks and the email regex entirely.
         Raises ValueError if validation fails.
         """
-        import re
-        required = ['covenant_id', 'transaction_id', 'description', 'frequency', 'owner_email']
-        for key in required:
+        required = ('covenant_id', 'transaction_id', 'description', 'frequency', 'owner_email')
+        values = tuple(covenant.get(key) for key in required)
+        try:
+            if values in cls._covenant_validation_cache:
+                return
+        except TypeError:
+            # Unhashable field value; it will fail the isinstance check below.
+            pass
+        for key, value in zip(required, values):
             if key not in covenant:
                 raise ValueError(f"Covenant missing required field: {key}")
-            if not isinstance(covenant[key], str):
+            if not isinstance(value, str):
                 raise ValueError(f"Covenant field {key} must be a string")
         # Validate frequency
         allowed_frequencies = {'daily', 'weekly', 'monthly', 'quarterly', 'annually'}
         if covenant['frequency'].lower() not in allowed_frequencies:
             raise ValueError(f"Covenant frequency must be one of {allowed_frequencies}")
         # Validate email format
-        email_regex = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
-        if not re.match(email_regex, covenant['owner_email']):
+        if not _EMAIL_RE.match(covenant['owner_email']):
             raise ValueError(f"Covenant owner_email is not a valid email address: {covenant['owner_email']}")
+        if len(cls._covenant_validation_cache) >= cls._COVENANT_VALIDATION_CACHE_MAX:
+            cls._covenant_validation_cache.pop(next(iter(cls._covenant_validation_cache)))
+        cls._covenant_validation_cache[values] = None
 
-    def generate_schedules(self, transaction: Dict[str, Any], covenants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def generate_schedules(self, transaction: Dict[str, Any], covenants: List[Dict[str, Any]],
+                           return_format: str = 'records') -> Any:
         """
         Generate all schedule entries for the given transaction and covenants.
 
+        Args:
+            transaction (dict): Transaction info with transaction_id, start_date, end_date, etc.
+            covenants (list): List of covenant dicts, each with frequency, covenant_id, etc.
+            return_format (str): 'records' (default) for a list of entries, or
+                'columnar' for a dict of contiguous per-field NumPy arrays
+                (dates as datetime64[D]), which is far more compact for large
+                outputs and can feed Database.save_schedules directly.
+
+        Results are memoized per input batch: regenerating the same
+        transaction/covenants returns a deep copy of the cached list (deep so
+        callers mutating entries don't poison the cache). Holiday set and
+        adjustment direction are fixed per instance, so they need no key.
+
+        Returns:
+            List[ScheduleEntry] or Dict[str, np.ndarray], per return_format.
+        """
+        if return_format not in ('records', 'columnar'):
+            raise ValueError("return_format must be 'records' or 'columnar'")
+        try:
+            key = (tuple(sorted(transaction.items())),
+                   tuple(tuple(sorted(c.items())) for c in covenants))
+            cached = self._schedule_cache.get(key)
+        except TypeError:
+            # Unhashable or unorderable input values: generate without caching.
+            key = cached = None
+        if cached is not None:
+            if return_format == 'columnar':
+                return self._to_columnar(cached)
+            # Entry fields are all immutable strings, so flat per-entry
+            # copies isolate callers as fully as a deepcopy would.
+            return [entry.copy() for entry in cached]
+        if len(covenants) >= PARALLEL_COVENANT_THRESHOLD:
+            schedules = self._generate_parallel(transaction, covenants)
+        else:
+            schedules = list(self.iter_schedules(transaction, covenants))
+        if key is not None:
+            if len(self._schedule_cache) >= SCHEDULE_CACHE_MAX:
+                # Drop the oldest entry (insertion order) to cap memory.
+                self._schedule_cache.pop(next(iter(self._schedule_cache)))
+            self._schedule_cache[key] = [entry.copy() for entry in schedules]
+        if return_format == 'columnar':
+            return self._to_columnar(schedules)
+        return schedules
+
+    @staticmethod
+    def _to_columnar(schedules: List[ScheduleEntry]) -> Dict[str, np.ndarray]:
+        """
+        Transpose a list of entries into a dict of per-field column arrays
+        (struct-of-arrays). String fields become NumPy unicode arrays and the
+        date fields become datetime64[D].
+        """
+        return {
+            'schedule_id': np.array([e.schedule_id for e in schedules], dtype=str),
+            'covenant_id': np.array([e.covenant_id for e in schedules], dtype=str),
+            'due_date': np.array([e.due_date for e in schedules], dtype='datetime64[D]'),
+            'status': np.array([e.status for e in schedules], dtype=str),
+            'period_start': np.array([e.period_start for e in schedules], dtype='datetime64[D]'),
+            'period_end': np.array([e.period_end for e in schedules], dtype='datetime64[D]'),
+        }
+
+    def _generate_parallel(self, transaction: Dict[str, Any], covenants: List[Dict[str, Any]]) -> List[ScheduleEntry]:
+        """
+        Fan schedule generation out across a thread pool. The heavy date math
+        runs inside NumPy calls that release the GIL, so threads scale with
+        cores without the pickling and spawn cost of worker processes;
+        validation runs once here and results keep input order.
+        """
+        start, end, plan = self._build_plan(transaction, covenants)
+        # One task per distinct frequency: candidate dates depend only on
+        # (start, end, frequency), so each template is computed once and
+        # broadcast across every covenant sharing that frequency.
+        reps: Dict[str, tuple] = {}
+        for method, cov in plan:
+            reps.setdefault(cov['frequency'].lower(), (method, cov))
+
+        def _template(item):
+            method, cov = item
+            # Suffix fragments are formatted once per template row; the
+            # broadcast below only pays one concatenation per entry.
+            return [(f"-{i:03d}", e.due_date, e.period_start, e.period_end)
+                    for i, e in enumerate(method(start, end, cov), 1)]
+
+        templates: Dict[str, list] = {}
+        max_workers = min(os.cpu_count() or 1, max(len(reps), 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for freq, rows in zip(reps, ex.map(_template, reps.values())):
+                templates[freq] = rows
+        schedules: List[ScheduleEntry] = []
+        for method, cov in plan:
+            cid = cov['covenant_id']
+            prefix = f"SCH-{cid}"
+            for suffix, due, ps, pe in templates[cov['frequency'].lower()]:
+                schedules.append(ScheduleEntry(prefix + suffix, cid, due, _STATUS_PENDING, ps, pe))
+        return schedules
+
+    def iter_schedules(self, transaction: Dict[str, Any], covenants: List[Dict[str, Any]]) -> Iterator[ScheduleEntry]:
+        """
+        Stream schedule entries for the given transaction and covenants.
+
+        Validation runs eagerly before the first entry is produced; entry
+        generation itself is lazy, so the stream can feed
+        Database.save_schedules without materializing the full list.
+
         Args:
             transaction (dict): Transaction info with transaction_id, start_date, end_date, etc.
             covenants (list): List of covenant dicts, each with frequency, covenant_id, etc.
 
         Returns:
-            List[dict]: List of schedule dicts.
+            Iterator[ScheduleEntry]: Lazily generated schedule entries.
         """
-        self._validate_transaction(transaction)
-        seen_covenant_ids = set()
+        start, end, plan = self._build_plan(transaction, covenants)
+
+        def _stream():
+            # Candidate dates depend only on (start, end, frequency), so the
+            # first covenant of each frequency computes them and later ones
+            # reuse the recorded (idx, due, period) rows with their own ids.
+            templates = {}
+            for method, cov in plan:
+                freq = cov['frequency'].lower()
+                rows = templates.get(freq)
+                if rows is None:
+                    rows = []
+                    for i, entry in enumerate(method(start, end, cov), 1):
+                        # Suffix fragments are formatted once here and shared
+                        # by every later covenant of this frequency.
+                        rows.append((f"-{i:03d}", entry.due_date, entry.period_start, entry.period_end))
+                        yield entry
+                    templates[freq] = rows
+                else:
+                    prefix = f"SCH-{cov['covenant_id']}"
+                    cid = cov['covenant_id']
+                    for suffix, due, ps, pe in rows:
+                        yield ScheduleEntry(prefix + suffix, cid, due, _STATUS_PENDING, ps, pe)
+        return _stream()
+
+    def _build_plan(self, transaction: Dict[str, Any], covenants: List[Dict[str, Any]]):
+        """
+        Validate the batch and resolve each covenant to its generation method.
+        Returns (start, end, plan) where plan is a list of (method, covenant)
+        pairs; covenants whose frequency cannot fit the transaction duration
+        are skipped.
+        """
+        # Validation parses the dates once; reuse them for the whole batch.
+        start, end = self._validate_transaction(transaction)
+        duration_days = (end - start).days
+        # Uniqueness: covenant_ids must be unique in this batch. One upfront
+        # length check replaces a per-covenant set lookup, and the error can
+        # name every duplicate rather than just the first.
+        ids = [c['covenant_id'] for c in covenants]
+        if len(set(ids)) != len(ids):
+            dups = sorted({x for x in ids if ids.count(x) > 1})
+            raise ValueError(f"Duplicate covenant_id found: {', '.join(dups)}")
         transaction_id = transaction['transaction_id']
-        schedules = []
+        plan = []
+        # Computed lazily at most once per batch: whether [start, end] holds
+        # any business day at all (it almost always does).
+        no_bday = None
         for cov in covenants:
             self._validate_covenant(cov)
             # Referential integrity: covenant's transaction_id must match
             if cov['transaction_id'] != transaction_id:
                 raise ValueError(f"Covenant {cov['covenant_id']} transaction_id does not match transaction")
-            # Uniqueness: covenant_id must be unique in this batch
-            if cov['covenant_id'] in seen_covenant_ids:
-                raise ValueError(f"Duplicate covenant_id found: {cov['covenant_id']}")
-            seen_covenant_ids.add(cov['covenant_id'])
             # Business rule: frequency must be appropriate for transaction duration
             freq = cov['frequency'].lower()
-            start = datetime.strptime(transaction['start_date'], '%Y-%m-%d').date()
-            end = datetime.strptime(transaction['end_date'], '%Y-%m-%d').date()
-            duration_days = (end - start).days
             # Only block frequencies that are truly impossible for the transaction duration
             if freq == 'annually' and duration_days < 365:
                 continue  # No annual schedules possible, skip
@@ -133,139 +446,256 @@ class ScheduleGenerator:
                 continue  # No quarterly schedules possible, skip
             if freq == 'monthly' and duration_days < 28:
                 continue  # No monthly schedules possible, skip
+            # All-holiday windows: daily emits nothing, and weekly with
+            # forward adjustment rolls every due date past the cutoff, so
+            # both can skip straight past generation.
+            if freq == 'daily' or (freq == 'weekly' and self.business_day_adjustment == 'forward'):
+                if no_bday is None:
+                    no_bday = not self._any_business_day_in(start.toordinal(), end.toordinal())
+                if no_bday:
+                    continue
             # Use the appropriate schedule generation method
             method = getattr(self, f'_generate_{freq}_schedules', None)
-            if method:
-                schedules.extend(method(transaction, cov))
-            else:
+            if method is None:
                 raise ValueError(f"Unsupported frequency: {freq}")
-        return schedules
+            plan.append((method, cov))
+        return start, end, plan
 
     # =============================
     # Schedule Generation Methods
     # =============================
 
-    def _generate_monthly_schedules(self, transaction, covenant):
+    def _generate_monthly_schedules(self, start, end, covenant):
         """Generate monthly schedules."""
-        return self._generate_periodic_schedules(transaction, covenant, months=1)
+        return self._generate_periodic_schedules(start, end, covenant, months=1)
 
-    def _generate_quarterly_schedules(self, transaction, covenant):
+    def _generate_quarterly_schedules(self, start, end, covenant):
         """Generate quarterly schedules."""
-        return self._generate_periodic_schedules(transaction, covenant, months=3)
+        return self._generate_periodic_schedules(start, end, covenant, months=3)
 
-    def _generate_annually_schedules(self, transaction, covenant):
+    def _generate_annually_schedules(self, start, end, covenant):
         """Generate annual schedules."""
-        return self._generate_periodic_schedules(transaction, covenant, months=12)
+        return self._generate_periodic_schedules(start, end, covenant, months=12)
 
-    def _generate_weekly_schedules(self, transaction, covenant):
+    def _generate_weekly_schedules(self, start, end, covenant):
         """
         Generate weekly schedules. Each period is 7 days, due date is the next business day after the period.
         """
-        start = datetime.strptime(transaction['start_date'], '%Y-%m-%d').date()
-        end = datetime.strptime(transaction['end_date'], '%Y-%m-%d').date()
-        schedules = []
-        period_start = start
+        # All candidate due dates (one per 7-day period) are adjusted in a
+        # single batch call instead of one Python-loop adjustment per week.
+        start_ord = start.toordinal()
+        end_ord = end.toordinal()
+        n = (end_ord - start_ord + 6) // 7
+        if n <= 0:
+            return
+        dues = np.arange(start_ord + 7, start_ord + 7 * (n + 1), 7, dtype='int64')
+        adjusted = self._adjust_to_business_days(dues)
+        # Adjusted dues are monotonic, so the cutoff filter matches the
+        # previous early break.
+        keep = adjusted <= end_ord
         idx = 1
-        while period_start < end:
-            period_end = period_start + timedelta(days=6)
-            due_date = period_start + timedelta(days=7)
-            # Adjust due date to business day if needed
-            if not self._is_business_day(due_date):
-                due_date = self._adjust_to_business_day(due_date, forward=(self.business_day_adjustment == 'forward'))
-            if due_date > end:
-                break
-            schedules.append(self._make_schedule_entry(covenant, idx, due_date, period_start, period_end))
-            period_start += timedelta(days=7)
+        for ps, due_ord in zip(dues[keep].tolist(), adjusted[keep].tolist()):
+            period_start = date.fromordinal(ps - 7)
+            yield self._make_schedule_entry(covenant, idx, date.fromordinal(due_ord),
+                                            period_start, period_start + timedelta(days=6))
             idx += 1
-        return schedules
 
-    def _generate_daily_schedules(self, transaction, covenant):
+    def _generate_daily_schedules(self, start, end, covenant):
         """
         Generate daily schedules. Only business days are considered for schedule generation.
         """
-        start = datetime.strptime(transaction['start_date'], '%Y-%m-%d').date()
-        end = datetime.strptime(transaction['end_date'], '%Y-%m-%d').date()
-        schedules = []
+        # Vectorized path: compute the business-day mask and all due-date
+        # adjustments as NumPy array operations instead of a per-day Python
+        # loop. The daily frequency is the only one that scales with the
+        # number of calendar days, so it is the path worth vectorizing.
+        start_ord = start.toordinal()
+        end_ord = end.toordinal()
+        days = np.arange(start_ord, end_ord, dtype='int64')
+        holiday_ords = np.array(sorted(self._holiday_ordinals), dtype='int64')
+        # Ordinal 1 is a Monday, so (o - 1) % 7 is the weekday.
+        is_bday = ((days - 1) % 7 < 5) & ~np.isin(days, holiday_ords)
+        biz_days = days[is_bday]
+        if biz_days.size == 0:
+            return
+        # Due date is the next day, rolled to a business day in the
+        # configured direction.
+        due_ords = self._adjust_to_business_days(biz_days + 1)
+        # Transaction end cutoff (due dates are monotonic, so the filter is
+        # equivalent to the previous early break).
+        keep = due_ords <= end_ord
         idx = 1
-        current = start
-        while current < end:
-            if self._is_business_day(current):
-                due_date = current + timedelta(days=1)
-                due_date = self._adjust_to_business_day(due_date, forward=(self.business_day_adjustment == 'forward'))
-                if due_date > end:
-                    break
-                schedules.append(self._make_schedule_entry(covenant, idx, due_date, current, current))
-                idx += 1
-            current += timedelta(days=1)
-        return schedules
+        for o, due_ord in zip(biz_days[keep].tolist(), due_ords[keep].tolist()):
+            current = date.fromordinal(o)
+            yield self._make_schedule_entry(covenant, idx, date.fromordinal(due_ord), current, current)
+            idx += 1
 
-    def _generate_periodic_schedules(self, transaction, covenant, months):
+    def _generate_periodic_schedules(self, start, end, covenant, months):
         """
         Generate schedules for monthly, quarterly, or annual covenants.
 
+        The edge-case classification (month-end anchor, Feb-29 anniversary,
+        quarterly month-end) is invariant for a given covenant, so it is
+        decided once here and dispatched to an inner loop specialized for
+        that shape instead of re-branching on every period.
+
         Args:
             months (int): Number of months per period (1, 3, or 12)
         """
-        start = datetime.strptime(transaction['start_date'], '%Y-%m-%d').date()
-        end = datetime.strptime(transaction['end_date'], '%Y-%m-%d').date()
-        schedules = []
+        is_month_end = (_days_in_month(start.year, start.month) == start.day)
+        if months == 12 and start.month == 2 and start.day == 29:
+            return self._periodic_feb29_annual(start, end, covenant)
+        if months == 3 and is_month_end:
+            return self._periodic_quarterly_month_end(start, end, covenant)
+        if is_month_end:
+            return self._periodic_month_end(start, end, covenant, months)
+        return self._periodic_plain(start, end, covenant, months)
+
+    @staticmethod
+    def _max_periods(start: date, end: date, months: int, due_for) -> int:
+        """
+        Largest period index whose (pre-adjustment) due date is on or before
+        the transaction end. Computed arithmetically so the emission loops
+        need no per-iteration cutoff check; due_for(i) is monotonic in i, so
+        at most a couple of boundary candidates are probed.
+        """
+        diff = (end.year - start.year) * 12 + (end.month - start.month)
+        n = diff // months + 1
+        while n > 0 and due_for(n) > end:
+            n -= 1
+        return n
+
+    def _periodic_emit(self, start, end, covenant, months, due_for):
+        """
+        Shared emit loop for the periodic shapes: computes every candidate
+        due date up front and adjusts them to business days in one batch
+        call, so the per-period work is just entry construction.
+        """
+        n = self._max_periods(start, end, months, due_for)
+        if n <= 0:
+            return
+        # Period bounds are held as packed day ordinals (8 bytes each) rather
+        # than a list of date objects; dates materialize only at emit time.
+        bounds = array('q', (_add_months(start, i * months).toordinal() for i in range(n + 1)))
+        dues = self._adjust_to_business_days(
+            np.fromiter((due_for(i).toordinal() for i in range(1, n + 1)), dtype='int64', count=n))
+        for i in range(1, n + 1):
+            yield self._make_schedule_entry(covenant, i, date.fromordinal(int(dues[i - 1])),
+                                            date.fromordinal(bounds[i - 1]),
+                                            date.fromordinal(bounds[i] - 1))
+
+    def _periodic_plain(self, start, end, covenant, months):
+        """
+        Periodic schedules anchored on the start day-of-month, clamped to the
+        last day of shorter months (e.g., the 30th in February).
+        """
+        # The clamp in _add_months reproduces the anchor-day-or-month-end rule,
+        # so the period start doubles as the (pre-adjustment) due date.
+        due_for = lambda i: _add_months(start, i * months)
+        yield from self._periodic_emit(start, end, covenant, months, due_for)
+
+    def _periodic_month_end(self, start, end, covenant, months):
+        """
+        Periodic schedules for a month-end start: the due date is always the
+        last day of the due month (so a Feb 28 anchor still hits Feb 29 in
+        leap years).
+        """
+        def due_for(i):
+            idx = start.month - 1 + i * months
+            year = start.year + idx // 12
+            month = idx % 12 + 1
+            return date(year, month, _days_in_month(year, month))
+
+        yield from self._periodic_emit(start, end, covenant, months, due_for)
+
+    def _periodic_feb29_annual(self, start, end, covenant):
+        """
+        Annual schedules anchored on Feb 29: due Feb 29 in leap years,
+        Feb 28 otherwise.
+        """
+        due_for = lambda i: (date(start.year + i, 2, 29) if calendar.isleap(start.year + i)
+                             else date(start.year + i, 2, 28))
+        yield from self._periodic_emit(start, end, covenant, 12, due_for)
+
+    def _periodic_quarterly_month_end(self, start, end, covenant):
+        """
+        Quarterly schedules for a month-end start. Quarters that roll past
+        February additionally emit a Feb 28/29 due date so the quarter ending
+        in February is covered.
+        """
+        def due_for(i):
+            idx = start.month - 1 + i * 3
+            year = start.year + idx // 12
+            month = idx % 12 + 1
+            return date(year, month, _days_in_month(year, month))
+
+        n = self._max_periods(start, end, 3, due_for)
         idx = 1
         period_start = start
-        orig_day = start.day
-        is_month_end = (calendar.monthrange(start.year, start.month)[1] == start.day)
-        while True:
-            next_period_start = period_start + relativedelta(months=months)
-            period_end = next_period_start - timedelta(days=1)
-
-            # Month-end logic: if start is month-end, always use month-end for due date
-            if is_month_end:
-                due_date = next_period_start.replace(day=calendar.monthrange(next_period_start.year, next_period_start.month)[1])
-            else:
-                # Try to use the same day as original, or last day if not possible (e.g., Feb)
-                try:
-                    due_date = next_period_start.replace(day=orig_day)
-                except ValueError:
-                    due_date = next_period_start.replace(day=calendar.monthrange(next_period_start.year, next_period_start.month)[1])
-
-            # Leap year handling for annual schedules: if start is Feb 29, try to use Feb 29 if possible
-            if months == 12 and start.month == 2 and start.day == 29:
-                if calendar.isleap(next_period_start.year):
-                    due_date = next_period_start.replace(month=2, day=29)
-                else:
-                    due_date = next_period_start.replace(month=2, day=28)
-
-            # For quarterly, if start is month-end, ensure Feb 28/29 is possible
-            # Special handling: if the next period's month is March, also generate a Feb 28/29 due date for the previous quarter
-            if months == 3 and is_month_end:
-                if next_period_start.month == 3:
-                    feb_due_date = next_period_start.replace(month=2, day=calendar.monthrange(next_period_start.year, 2)[1])
-                    # Adjust Feb due date to business day if needed
-                    if not self._is_business_day(feb_due_date):
-                        feb_due_date = self._adjust_to_business_day(feb_due_date, forward=(self.business_day_adjustment == 'forward'))
-                    if feb_due_date <= end:
-                        schedules.append(self._make_schedule_entry(covenant, idx, feb_due_date, period_start, feb_due_date))
-                        idx += 1
-
-            # Transaction end cutoff: allow due_date == end
-            if due_date > end:
-                break
-
-            # Always adjust to business day for periodic schedules
+        forward = (self.business_day_adjustment == 'forward')
+        for i in range(1, n + 1):
+            next_period_start = _add_months(start, i * 3)
+            if next_period_start.month == 3:
+                feb_due_date = date(next_period_start.year, 2, _days_in_month(next_period_start.year, 2))
+                if not self._is_business_day(feb_due_date):
+                    feb_due_date = self._adjust_to_business_day(feb_due_date, forward=forward)
+                if feb_due_date <= end:
+                    yield self._make_schedule_entry(covenant, idx, feb_due_date, period_start, feb_due_date)
+                    idx += 1
+            due_date = due_for(i)
             if not self._is_business_day(due_date):
-                due_date = self._adjust_to_business_day(due_date, forward=(self.business_day_adjustment == 'forward'))
-
-            schedules.append(self._make_schedule_entry(covenant, idx, due_date, period_start, period_end))
+                due_date = self._adjust_to_business_day(due_date, forward=forward)
+            yield self._make_schedule_entry(covenant, idx, due_date, period_start, next_period_start - timedelta(days=1))
             period_start = next_period_start
             idx += 1
-        return schedules
+        # The quarter just past the cutoff may still owe its February due
+        # date (its own quarter-end falls after the transaction end, but
+        # February does not).
+        next_period_start = _add_months(start, (n + 1) * 3)
+        if next_period_start.month == 3:
+            feb_due_date = date(next_period_start.year, 2, _days_in_month(next_period_start.year, 2))
+            if not self._is_business_day(feb_due_date):
+                feb_due_date = self._adjust_to_business_day(feb_due_date, forward=forward)
+            if feb_due_date <= end:
+                yield self._make_schedule_entry(covenant, idx, feb_due_date, period_start, feb_due_date)
 
     # =============================
     # Business Day Utilities
     # =============================
 
+    def _ensure_bday_window(self, ordinal: int):
+        """
+        Make sure the business-day bitset covers the given ordinal (with
+        padding), rebuilding over the widened range if not. The bitset packs
+        one business-day flag per day, 64 days per array('Q') word, indexed
+        by absolute day ordinal.
+        """
+        if self._bday_table is not None and self._bday_lo + 16 <= ordinal <= self._bday_hi - 16:
+            return
+        with self._bday_lock:
+            # Another thread may have rebuilt while this one waited.
+            if self._bday_table is not None and self._bday_lo + 16 <= ordinal <= self._bday_hi - 16:
+                return
+            # Grow generously past the requested ordinal so sequential callers
+            # (weekly/periodic stepping) don't trigger a rebuild per call.
+            lo = min(self._bday_lo, ordinal - 16) if self._bday_table is not None else ordinal - 16
+            hi = max(self._bday_hi, ordinal + 400) if self._bday_table is not None else ordinal + 400
+            base_word = lo >> 6
+            words = [0] * ((hi >> 6) - base_word + 1)
+            hol = self._holiday_ordinals
+            for o in range(lo, hi + 1):
+                # Ordinal 1 was a Monday, so (o - 1) % 7 < 5 means Mon-Fri.
+                if (o - 1) % 7 < 5 and o not in hol:
+                    words[(o >> 6) - base_word] |= 1 << (o & 63)
+            self._bday_table = (base_word, array('Q', words))
+            self._bday_lo = lo
+            self._bday_hi = hi
+
     def _adjust_to_business_day(self, d: date, forward: bool = True) -> date:
         """
         Move date to the next (or previous) business day if it falls on a weekend or holiday.
+        Resolved against the precomputed bitset: a shift/mask isolates the
+        candidate days in the current 64-day word and a single bit scan jumps
+        straight to the answer, instead of stepping day by day.
 
         Args:
             d (date): The date to adjust
@@ -274,20 +704,89 @@ class ScheduleGenerator:
         Returns:
             date: Adjusted business day
         """
-        step = timedelta(days=1) if forward else timedelta(days=-1)
-        attempts = 0
-        while not self._is_business_day(d):
-            d += step
-            attempts += 1
-            if attempts > 10:
-                raise RuntimeError("Unable to find a business day within 10 days. Check holiday/weekend configuration.")
-        return d
+        o = d.toordinal()
+        self._ensure_bday_window(o)
+        base_word, bits = self._bday_table
+        w = (o >> 6) - base_word
+        if forward:
+            word = bits[w] >> (o & 63)
+            if word:
+                adjusted = o + (word & -word).bit_length() - 1
+            else:
+                adjusted = -1
+                for i in range(w + 1, len(bits)):
+                    if bits[i]:
+                        lsb = bits[i] & -bits[i]
+                        adjusted = ((base_word + i) << 6) + lsb.bit_length() - 1
+                        break
+        else:
+            word = bits[w] & ((1 << ((o & 63) + 1)) - 1)
+            if word:
+                adjusted = ((base_word + w) << 6) + word.bit_length() - 1
+            else:
+                adjusted = -1
+                for i in range(w - 1, -1, -1):
+                    if bits[i]:
+                        adjusted = ((base_word + i) << 6) + bits[i].bit_length() - 1
+                        break
+        if adjusted < 0 or abs(adjusted - o) > 10:
+            raise RuntimeError("Unable to find a business day within 10 days. Check holiday/weekend configuration.")
+        return date.fromordinal(adjusted)
+
+    def _any_business_day_in(self, start_ord: int, end_ord: int) -> bool:
+        """
+        True if any day in [start_ord, end_ord] is a business day. One masked
+        popcount-style scan over the bitset words covering the range.
+        """
+        if end_ord < start_ord:
+            return False
+        self._ensure_bday_window(start_ord)
+        self._ensure_bday_window(end_ord)
+        base_word, bits = self._bday_table
+        w0 = (start_ord >> 6) - base_word
+        w1 = (end_ord >> 6) - base_word
+        for w in range(w0, w1 + 1):
+            word = bits[w]
+            if w == w0:
+                word &= ~((1 << (start_ord & 63)) - 1)
+            if w == w1:
+                word &= (1 << ((end_ord & 63) + 1)) - 1
+            if word:
+                return True
+        return False
+
+    def _adjust_to_business_days(self, ordinals: np.ndarray) -> np.ndarray:
+        """
+        Batch counterpart of _adjust_to_business_day: roll an int64 array of
+        day ordinals to business days in one np.busday_offset call, using the
+        generator's configured adjustment direction.
+
+        Returns:
+            np.ndarray: Adjusted day ordinals (int64).
+        """
+        holidays64 = (np.array(sorted(self._holiday_ordinals), dtype='int64')
+                      - EPOCH_ORDINAL).astype('datetime64[D]')
+        roll = 'forward' if self.business_day_adjustment == 'forward' else 'backward'
+        dates64 = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+        adjusted = np.busday_offset(dates64, 0, roll=roll, holidays=holidays64)
+        adjusted_ords = adjusted.astype('int64') + EPOCH_ORDINAL
+        if adjusted_ords.size and int(np.abs(adjusted_ords - ordinals).max()) > 10:
+            raise RuntimeError("Unable to find a business day within 10 days. Check holiday/weekend configuration.")
+        return adjusted_ords
 
     def _is_business_day(self, d: date) -> bool:
         """
         Returns True if the date is a business day (Mon-Fri and not a holiday).
+        Answered from the precomputed bitset when its window already covers
+        the date (one shift and mask); otherwise computed directly, without
+        forcing a window build for a one-off query.
         """
-        return d.weekday() < 5 and d.strftime('%Y-%m-%d') not in self.holidays
+        o = d.toordinal()
+        table = self._bday_table
+        if table is not None and self._bday_lo <= o <= self._bday_hi:
+            base_word, bits = table
+            return bool((bits[(o >> 6) - base_word] >> (o & 63)) & 1)
+        return d.weekday() < 5 and o not in self._holiday_ordinals
 
     # =============================
     # Schedule Entry Construction
@@ -305,13 +804,18 @@ class ScheduleGenerator:
             period_end (date): End of the period
 
         Returns:
-            dict: Schedule entry
+            ScheduleEntry: Schedule entry
         """
-        return {
-            'schedule_id': f"SCH-{covenant['covenant_id']}-{idx:03d}",
-            'covenant_id': covenant['covenant_id'],
-            'due_date': due_date.strftime('%Y-%m-%d'),
-            'status': 'pending',
-            'period_start': period_start.strftime('%Y-%m-%d'),
-            'period_end': period_end.strftime('%Y-%m-%d')
-        }
+        cid = covenant['covenant_id']
+        ps = period_start.isoformat()
+        # Daily entries pass the same date for both period bounds; share the
+        # one string instead of formatting it twice.
+        pe = ps if period_end == period_start else period_end.isoformat()
+        return ScheduleEntry(
+            schedule_id=f"SCH-{cid}-{idx:03d}",
+            covenant_id=cid,
+            due_date=due_date.isoformat(),
+            status=_STATUS_PENDING,
+            period_start=ps,
+            period_end=pe
+        )
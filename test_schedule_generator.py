@@ -4,41 +4,52 @@ Comprehensive Test Suite for Covenant Schedule Generator
 
 import pytest
 import random
+from functools import lru_cache
 from schedule_generator import ScheduleGenerator
 from datetime import date
 
 # --- Test Data Factories ---
+# The cached builders return immutable item tuples; the public factories wrap
+# them in a fresh dict so tests that mutate their input stay safe.
+
+@lru_cache(maxsize=None)
+def _make_transaction_cached(start, end):
+    return (
+        ("transaction_id", "TXN-TEST"),
+        ("name", "Test Transaction"),
+        ("start_date", start),
+        ("end_date", end),
+    )
+
 def make_transaction(start, end):
     # Factory function to create a mock transaction dictionary for use in tests.
     """Create a transaction dict for testing."""
-    return {
-        "transaction_id": "TXN-TEST",
-        "name": "Test Transaction",
-        "start_date": start,
-        "end_date": end
-    }
+    return dict(_make_transaction_cached(start, end))
+
+@lru_cache(maxsize=None)
+def _make_covenant_cached(freq, cid):
+    return (
+        ("covenant_id", cid),
+        ("transaction_id", "TXN-TEST"),
+        ("description", f"{freq.title()} Covenant"),
+        ("frequency", freq),
+        ("owner_email", "test@company.com"),
+    )
 
 def make_covenant(freq, cid="COV-TEST"):
     # Factory function to create a mock covenant dictionary for use in tests.
     """Create a covenant dict for testing."""
-    return {
-        "covenant_id": cid,
-        "transaction_id": "TXN-TEST",
-        "description": f"{freq.title()} Covenant",
-        "frequency": freq,
-        "owner_email": "test@company.com"
-    }
+    return dict(_make_covenant_cached(freq, cid))
 
 # =============================
 # Core Business Logic Tests
 # =============================
 
-def test_multiple_frequencies_same_transaction():
+def test_multiple_frequencies_same_transaction(sg):
     """
     Test that multiple covenants with different frequencies for the same transaction
     generate non-overlapping, correct schedules.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-06-01")
     covenants = [make_covenant("monthly", "COV-MONTH"), make_covenant("weekly", "COV-WEEK")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -47,12 +58,11 @@ def test_multiple_frequencies_same_transaction():
     assert any("COV-MONTH" in i for i in ids)
     assert any("COV-WEEK" in i for i in ids)
 
-def test_multiple_covenants_same_frequency():
+def test_multiple_covenants_same_frequency(sg):
     """
     Test that multiple covenants with the same frequency for the same transaction
     each get their own unique schedule.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly", "COV-1"), make_covenant("monthly", "COV-2")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -71,11 +81,10 @@ def test_transaction_start_end_on_weekend_or_holiday():
     schedules = sg.generate_schedules(transaction, covenants)
     assert all(date.fromisoformat(s['due_date']).weekday() < 5 for s in schedules)
 
-def test_schedule_regeneration_no_duplicates():
+def test_schedule_regeneration_no_duplicates(sg):
     """
     Test that regenerating schedules for the same transaction/covenant does not produce duplicate schedule_ids.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly")]
     schedules1 = sg.generate_schedules(transaction, covenants)
@@ -84,11 +93,10 @@ def test_schedule_regeneration_no_duplicates():
     ids2 = set(s['schedule_id'] for s in schedules2)
     assert ids1 == ids2
 
-def test_very_short_transaction():
+def test_very_short_transaction(sg):
     """
     Test that a transaction too short for the frequency produces no schedules.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-01-02")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -105,12 +113,11 @@ def test_all_days_are_holidays():
     schedules = sg.generate_schedules(transaction, covenants)
     assert len(schedules) == 0
 
-def test_bulk_insert_with_invalid_data():
+def test_bulk_insert_with_invalid_data(sg):
     """
     Test that the database layer rejects invalid schedule data (e.g., missing required fields).
     """
     from database import Database
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -121,21 +128,19 @@ def test_bulk_insert_with_invalid_data():
         with pytest.raises(Exception):
             db.save_schedules(schedules)
 
-def test_anniversary_on_feb_29():
+def test_anniversary_on_feb_29(sg):
     """
     Test that annual schedules starting on Feb 29 are handled correctly in leap and non-leap years.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2024-02-29", "2027-03-01")
     covenants = [make_covenant("annually")]
     schedules = sg.generate_schedules(transaction, covenants)
     assert any(s['due_date'].endswith('-02-28') or s['due_date'].endswith('-03-01') for s in schedules)
 
-def test_large_number_of_covenants():
+def test_large_number_of_covenants(sg):
     """
     Test that the generator can handle a large number of covenants efficiently and correctly.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-02-01")
     covenants = [make_covenant("daily", f"COV-{i:03d}") for i in range(200)]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -145,13 +150,12 @@ def test_large_number_of_covenants():
     unique_covs = set(s['covenant_id'] for s in schedules)
     assert len(unique_covs) == 200
 
-def test_monthly_schedule_generation():
+def test_monthly_schedule_generation(sg):
     """
     Test that monthly schedules are generated correctly for a multi-year transaction.
     - Verifies the correct number of schedules (one per month, inclusive of start/end year).
     - Checks that the first and last due dates are properly adjusted to the next business day if they fall on a weekend or holiday.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-15", "2027-01-15")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -173,11 +177,10 @@ def test_monthly_schedule_generation():
         d = sg2._adjust_to_business_day(d)
     assert schedules[-1]['due_date'] == d.strftime('%Y-%m-%d')
 
-def test_quarter_end_dates():
+def test_quarter_end_dates(sg):
     """
     Test that quarterly schedules handle February end dates correctly, including business day adjustment for non-leap years.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-03-31", "2026-03-31")
     covenants = [make_covenant("quarterly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -206,11 +209,10 @@ def test_weekend_adjustment():
         assert d.weekday() < 5  # Must be a weekday
         assert s['due_date'] not in sg.holidays  # Must not be a holiday
 
-def test_transaction_end_cutoff():
+def test_transaction_end_cutoff(sg):
     """
     Test that no due date is after the next business day after the transaction end date.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-03-01")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -221,11 +223,10 @@ def test_transaction_end_cutoff():
     for s in schedules:
         assert s['due_date'] <= end.strftime('%Y-%m-%d')
 
-def test_daily_schedule_generation():
+def test_daily_schedule_generation(sg):
     """
     Test that daily schedules are only generated for business days.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-01-10")
     covenants = [make_covenant("daily")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -233,13 +234,12 @@ def test_daily_schedule_generation():
         d = date.fromisoformat(s['due_date'])
         assert d.weekday() < 5
 
-def test_annual_schedule_generation():
+def test_annual_schedule_generation(sg):
     """
     Test that annual schedules are generated for the correct number of years and due dates are adjusted to business days.
     - Verifies that the number of annual schedules matches the number of years in the transaction period.
     - Ensures that due dates are adjusted to the next business day if they fall on a weekend or holiday.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-31", "2027-01-31")
     covenants = [make_covenant("annually")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -254,14 +254,13 @@ def test_annual_schedule_generation():
     assert schedules[0]['due_date'] == d.strftime('%Y-%m-%d')
 
 
-def test_bulk_insert_and_retrieval():
+def test_bulk_insert_and_retrieval(sg):
     """
     Test that bulk insert and retrieval of schedules via the database layer works as expected.
     - Saves a transaction, covenants, and generated schedules to an in-memory database.
     - Retrieves the schedules and verifies that all inserted schedules are present.
     """
     from database import Database
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly", "COV-001"), make_covenant("quarterly", "COV-002")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -274,12 +273,11 @@ def test_bulk_insert_and_retrieval():
         assert len(loaded) == len(schedules)
 
 # --- Additional Edge Case Tests ---
-def test_month_end_to_february():
+def test_month_end_to_february(sg):
     """
     Test that monthly schedules handle transitions from month-end (e.g., Jan 31) to February correctly.
     - Ensures that due dates for February are set to Feb 28 or Feb 29 as appropriate.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-31", "2025-03-31")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -287,12 +285,11 @@ def test_month_end_to_february():
     feb_due = any(s['due_date'].endswith('-02-28') or s['due_date'].endswith('-02-29') for s in schedules)
     assert feb_due
 
-def test_leap_year_february():
+def test_leap_year_february(sg):
     """
     Test that annual schedules include Feb 29 in leap years.
     - Ensures that a due date of Feb 29, 2024 is present when the transaction period covers a leap year.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2023-02-28", "2024-03-01")
     covenants = [make_covenant("annually")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -313,12 +310,11 @@ def test_due_date_on_holiday():
     for s in schedules:
         assert s['due_date'] != '2025-01-15'
 
-def test_due_date_on_weekend():
+def test_due_date_on_weekend(sg):
     """
     Test that due dates falling on weekends are adjusted to business days.
     - Ensures that all due dates are weekdays (Monday to Friday).
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-03", "2025-01-20")
     covenants = [make_covenant("weekly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -327,57 +323,52 @@ def test_due_date_on_weekend():
         d = date.fromisoformat(s['due_date'])
         assert d.weekday() < 5
 
-def test_large_dataset_performance():
+def test_large_dataset_performance(sg):
     """
     Test that the generator can handle large datasets efficiently.
     - Ensures that generating daily schedules for a 10-year period produces a large number of entries without crashing.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2020-01-01", "2030-01-01")
     covenants = [make_covenant("daily")]
     schedules = sg.generate_schedules(transaction, covenants)
     # Should not crash and should generate a large number of entries
     assert len(schedules) > 2500
 
-def test_invalid_transaction_missing_field():
+def test_invalid_transaction_missing_field(sg):
     """
     Test that the generator raises a ValueError if the transaction is missing required fields.
     - Covers missing end_date and other required transaction fields.
     """
-    sg = ScheduleGenerator()
     transaction = {"transaction_id": "TXN-FAIL", "start_date": "2025-01-01"}  # missing end_date
     covenants = [make_covenant("monthly")]
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, covenants)
 
-def test_invalid_covenant_missing_field():
+def test_invalid_covenant_missing_field(sg):
     """
     Test that the generator raises a ValueError if a covenant is missing required fields.
     - Covers missing description and other required covenant fields.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-12-31")
     covenants = [{"covenant_id": "COV-FAIL", "transaction_id": "TXN-TEST", "frequency": "monthly", "owner_email": "test@company.com"}]  # missing description
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, covenants)
 
-def test_unsupported_frequency():
+def test_unsupported_frequency(sg):
     """
     Test that the generator raises a ValueError for unsupported covenant frequencies.
     - Covers frequencies not recognized by the business logic (e.g., 'fortnightly').
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-12-31")
     covenants = [make_covenant("fortnightly")]
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, covenants)
 
-def test_schedule_id_uniqueness():
+def test_schedule_id_uniqueness(sg):
     """
     Test that all generated schedule_ids are unique across covenants for the same transaction.
     - Ensures no duplicate schedule_ids are produced.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly", "COV-001"), make_covenant("monthly", "COV-002")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -391,12 +382,11 @@ def test_update_and_delete_schedule():
     pass
 
 # --- Robustness and Real-World Edge Case Tests ---
-def test_invalid_data_types():
+def test_invalid_data_types(sg):
     """
     Test that the generator raises errors for invalid data types in input.
     - Covers integer transaction_id, string instead of list for covenants, and None for required fields.
     """
-    sg = ScheduleGenerator()
     # Integer instead of string for transaction_id
     transaction = {"transaction_id": 123, "name": 456, "start_date": 20250101, "end_date": 20250131}
     covenants = [make_covenant("monthly")]
@@ -411,12 +401,11 @@ def test_invalid_data_types():
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, covenants)
 
-def test_malformed_dates():
+def test_malformed_dates(sg):
     """
     Test that the generator raises ValueError for malformed or invalid date strings in transaction fields.
     - Covers various invalid date formats and impossible dates.
     """
-    sg = ScheduleGenerator()
     # Invalid date formats
     bad_dates = ["2025/01/01", "01-01-2025", "2025-13-01", "2025-00-10", "2025-02-30", "not-a-date"]
     for bad in bad_dates:
@@ -428,12 +417,11 @@ def test_malformed_dates():
         with pytest.raises(ValueError):
             sg.generate_schedules(transaction, covenants)
 
-def test_boundary_and_edge_cases():
+def test_boundary_and_edge_cases(sg):
     """
     Test various boundary and edge cases for transaction and covenant input.
     - Start and end on same day, end before start, empty string fields, and extra/unexpected fields.
     """
-    sg = ScheduleGenerator()
     # Start and end on same day
     transaction = make_transaction("2025-01-01", "2025-01-01")
     covenants = [make_covenant("monthly")]
@@ -453,12 +441,11 @@ def test_boundary_and_edge_cases():
     schedules = sg.generate_schedules(transaction, covenants)
     assert isinstance(schedules, list)
 
-def test_extreme_and_large_inputs():
+def test_extreme_and_large_inputs(sg):
     """
     Test generator robustness with extreme and large input sizes.
     - Very large number of covenants, very long/short transaction periods.
     """
-    sg = ScheduleGenerator()
     # Very large number of covenants
     transaction = make_transaction("2025-01-01", "2025-01-10")
     covenants = [make_covenant("daily", f"COV-{i:05d}") for i in range(1000)]
@@ -493,12 +480,11 @@ def test_all_due_dates_on_holidays():
     schedules = sg.generate_schedules(transaction, covenants)
     assert isinstance(schedules, list)
 
-def test_duplicate_and_referential_integrity():
+def test_duplicate_and_referential_integrity(sg):
     """
     Test that duplicate covenant_ids and referential integrity errors are caught.
     - Ensures ValueError is raised for duplicate covenant_ids and mismatched transaction_id.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-01-31")
     # Duplicate covenant_id
     covenants = [make_covenant("monthly", "COV-1"), make_covenant("monthly", "COV-1")]
@@ -510,12 +496,11 @@ def test_duplicate_and_referential_integrity():
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, [bad_cov])
 
-def test_unsupported_frequencies_and_case_sensitivity():
+def test_unsupported_frequencies_and_case_sensitivity(sg):
     """
     Test that unsupported frequencies and case sensitivity are handled correctly.
     - Ensures ValueError for unsupported, empty, or None frequency, and that uppercase frequencies are accepted.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-12-31")
     # Unsupported frequency
     covenants = [make_covenant("biweekly")]
@@ -535,12 +520,11 @@ def test_unsupported_frequencies_and_case_sensitivity():
     with pytest.raises(ValueError):
         sg.generate_schedules(transaction, [bad_cov])
 
-def test_email_validation():
+def test_email_validation(sg):
     """
     Test that invalid, empty, or None email addresses in covenants are rejected.
     - Ensures ValueError is raised for invalid email formats.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-12-31")
     # Invalid email formats
     bad_cov = make_covenant("monthly", "COV-EMAIL1")
@@ -576,12 +560,11 @@ def test_business_day_adjustment_backward():
         d = date.fromisoformat(s['due_date'])
         assert d.weekday() < 5
 
-def test_schedule_uniqueness_and_consistency():
+def test_schedule_uniqueness_and_consistency(sg):
     """
     Test that schedule generation is consistent and unique for the same input.
     - Ensures no overlap in schedule_ids between covenants and that repeated calls are consistent.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly", "COV-001"), make_covenant("monthly", "COV-002")]
     schedules1 = sg.generate_schedules(transaction, covenants)
@@ -598,12 +581,11 @@ def test_schedule_uniqueness_and_consistency():
             if cov1 != cov2:
                 assert ids_by_cov[cov1].isdisjoint(ids_by_cov[cov2])
 
-def test_leap_year_and_month_end_edge_cases():
+def test_leap_year_and_month_end_edge_cases(sg):
     """
     Test leap year and month-end edge cases for annual and monthly schedules.
     - Ensures correct handling of Feb 29 and month-end transitions.
     """
-    sg = ScheduleGenerator()
     # Feb 29 start, ends on Feb 28 non-leap year
     transaction = make_transaction("2024-02-29", "2025-02-28")
     covenants = [make_covenant("annually")]
@@ -615,13 +597,12 @@ def test_leap_year_and_month_end_edge_cases():
     schedules = sg.generate_schedules(transaction, covenants)
     assert any(s['due_date'].endswith('-02-28') or s['due_date'].endswith('-02-29') for s in schedules)
 
-def test_database_integration_invalid():
+def test_database_integration_invalid(sg):
     """
     Test that the database layer enforces required fields and uniqueness constraints.
     - Ensures exceptions are raised for missing required fields and duplicate schedules.
     """
     from database import Database
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly")]
     schedules = sg.generate_schedules(transaction, covenants)
@@ -641,18 +622,16 @@ def test_database_integration_invalid():
         with pytest.raises(Exception):
             db.save_schedules(schedules)
 
-def test_performance_large_dataset():
+def test_performance_large_dataset(sg):
     """
     Test generator and database performance with very large datasets.
     - Ensures large numbers of schedules can be generated, inserted, updated, and deleted without error.
     """
-    sg = ScheduleGenerator()
     transaction = make_transaction("2000-01-01", "2050-01-01")
     covenants = [make_covenant("daily")]
     schedules = sg.generate_schedules(transaction, covenants)
     assert len(schedules) > 10000
     from database import Database
-    sg = ScheduleGenerator()
     transaction = make_transaction("2025-01-01", "2025-04-01")
     covenants = [make_covenant("monthly", "COV-001")]
     schedules = sg.generate_schedules(transaction, covenants)